@@ -1,7 +1,7 @@
 import unittest
 
 from functools import partial
-from mock import patch
+from mock import MagicMock, patch
 from pathlib import Path
 
 from PyQt5.QtCore import QSettings
@@ -21,8 +21,21 @@ class TestCookieCutterChoice(GUITest):
     """Test the choices of initial boxes file
     """
 
-    @patch.object(QSettings, 'setValue')
-    def test_select_none(self, mock_setvalue):
+    def setUp(self):
+        super(TestCookieCutterChoice, self).setUp()
+
+        # Plain attribute swaps are much cheaper than patch decorators.
+        # Originals are restored by cleanups, which run even if setUp fails.
+        # They are taken from the class __dict__ because the values returned by
+        # attribute lookup on sip classes are not bound when set back.
+        self.addCleanup(setattr, QSettings, 'setValue',
+                        QSettings.__dict__['setValue'])
+        self.addCleanup(setattr, QFileDialog, 'getOpenFileName',
+                        QFileDialog.__dict__['getOpenFileName'])
+        QSettings.setValue = MagicMock()
+        QFileDialog.getOpenFileName = MagicMock()
+
+    def test_select_none(self):
         "User chooses to have no cookie cutter"
 
         cookie_cutter_choice().load(TESTDATA / '2x2.inselect_cookie_cutter')
@@ -34,10 +47,9 @@ class TestCookieCutterChoice(GUITest):
         self.window.cookie_cutter_widget.clear()
 
         self.assertEqual(None, cookie_cutter_choice().current)
-        mock_setvalue.assert_called_with(cookie_cutter_choice().PATH_KEY, '')
+        QSettings.setValue.assert_called_with(cookie_cutter_choice().PATH_KEY, '')
 
-    @patch.object(QSettings, 'setValue')
-    def test_chooses_cookie_cutter(self, mock_setvalue):
+    def test_chooses_cookie_cutter(self):
         "User chooses cookie cutter"
 
         w = self.window
@@ -45,32 +57,31 @@ class TestCookieCutterChoice(GUITest):
 
         path = TESTDATA / '2x2.inselect_cookie_cutter'
         retval = str(path), w.cookie_cutter_widget.FILE_FILTER
-        with patch.object(QFileDialog, 'getOpenFileName', return_value=retval) as mock_gofn:
-            w.cookie_cutter_widget.choose()
-            self.assertEqual(1, mock_gofn.call_count)
+        QFileDialog.getOpenFileName.return_value = retval
+        w.cookie_cutter_widget.choose()
+        self.assertEqual(1, QFileDialog.getOpenFileName.call_count)
 
         self.assertEqual(
             '2x2 (4 boxes)',
             cookie_cutter_choice().current.name
         )
-        mock_setvalue.assert_any_call(cookie_cutter_choice().PATH_KEY, str(path))
-        mock_setvalue.assert_any_call(
+        QSettings.setValue.assert_any_call(cookie_cutter_choice().PATH_KEY, str(path))
+        QSettings.setValue.assert_any_call(
             cookie_cutter_choice().DIRECTORY_KEY,
             str(path.parent)
         )
 
-    @patch.object(QFileDialog, 'getOpenFileName', return_value=(None, None))
-    def test_cancels_choose_cookie_cutter(self, mock_gofn):
+    def test_cancels_choose_cookie_cutter(self):
         "User cancels the 'choose cookie cutter' box"
 
         w = self.window
+        QFileDialog.getOpenFileName.return_value = (None, None)
         w.cookie_cutter_widget.clear()
         w.cookie_cutter_widget.choose()
         self.assertEqual(None, cookie_cutter_choice().current)
-        self.assertEqual(1, mock_gofn.call_count)
+        self.assertEqual(1, QFileDialog.getOpenFileName.call_count)
 
-    @patch.object(QSettings, 'setValue')
-    def test_save_to_cookie_cutter(self, mock_setvalue):
+    def test_save_to_cookie_cutter(self):
         "Create a new cookie cutter"
         w = self.window
         w.open_document(path=TESTDATA / 'shapes.inselect')
@@ -93,17 +104,16 @@ class TestCookieCutterChoice(GUITest):
             cookie_cutter_choice().current.name
         )
 
-    @patch.object(QSettings, 'setValue')
-    def test_new_document(self, mock_setvalue):
+    def test_new_document(self):
         "Create a new document with cookie cutter applied"
         w = self.window
         w.cookie_cutter_widget.clear()
 
         path = TESTDATA / '2x2.inselect_cookie_cutter'
         retval = str(path), w.cookie_cutter_widget.FILE_FILTER
-        with patch.object(QFileDialog, 'getOpenFileName', return_value=retval) as mock_gofn:
-            w.cookie_cutter_widget.choose()
-            self.assertEqual(1, mock_gofn.call_count)
+        QFileDialog.getOpenFileName.return_value = retval
+        w.cookie_cutter_widget.choose()
+        self.assertEqual(1, QFileDialog.getOpenFileName.call_count)
 
         with temp_directory_with_files(TESTDATA / 'shapes.png') as tempdir, \
                 patch.object(QMessageBox, 'information', return_value=QMessageBox.Yes) as mock_information:
@@ -116,8 +126,7 @@ class TestCookieCutterChoice(GUITest):
         self.assertEqual(4, w.model.rowCount())
         self.assertEqual(4, len(doc.items))
 
-    @patch.object(QSettings, 'setValue')
-    def test_apply_cookie_cutter(self, mock_setvalue):
+    def test_apply_cookie_cutter(self):
         "Applies the cookie cutter to the open document"
         w = self.window
         w.open_document(path=TESTDATA / 'shapes.inselect')
@@ -127,8 +136,8 @@ class TestCookieCutterChoice(GUITest):
 
         path = TESTDATA / '2x2.inselect_cookie_cutter'
         retval = str(path), w.cookie_cutter_widget.FILE_FILTER
-        with patch.object(QFileDialog, 'getOpenFileName', return_value=retval):
-            w.cookie_cutter_widget.choose()
+        QFileDialog.getOpenFileName.return_value = retval
+        w.cookie_cutter_widget.choose()
 
         with patch.object(QMessageBox, 'question', return_value=QMessageBox.Yes) as mock_question:
             w.apply_cookie_cutter()
@@ -1,6 +1,6 @@
 import unittest
 
-from mock import patch
+from mock import MagicMock, patch
 from pathlib import Path
 
 from PyQt5.QtWidgets import QFileDialog
@@ -35,9 +35,11 @@ class TestCopyToNewDocument(GUITest):
             (tempdir / 'shapes.png').rename(image)
 
             retval = str(image), w.IMAGE_FILE_FILTER
-            with patch.object(QFileDialog, 'getOpenFileName', return_value=retval) as mock_gofn:
-                w.copy_to_new_document()
-                self.assertEqual(1, mock_gofn.call_count)
+            self.addCleanup(setattr, QFileDialog, 'getOpenFileName',
+                            QFileDialog.__dict__['getOpenFileName'])
+            QFileDialog.getOpenFileName = MagicMock(return_value=retval)
+            w.copy_to_new_document()
+            self.assertEqual(1, QFileDialog.getOpenFileName.call_count)
 
             # New document should have been called with the path to the image
             self.assertTrue(mock_new_document.called)
@@ -1,6 +1,6 @@
 import unittest
 
-from mock import patch
+from mock import MagicMock
 from pathlib import Path
 
 from PyQt5.QtCore import QSettings
@@ -18,8 +18,25 @@ class TestUserTemplateChoice(GUITest):
     """Test the template choice
     """
 
-    @patch.object(QSettings, 'setValue')
-    def test_select_default(self, mock_setvalue):
+    def setUp(self):
+        super(TestUserTemplateChoice, self).setUp()
+
+        # Plain attribute swaps are much cheaper than patch decorators.
+        # Originals are restored by cleanups, which run even if setUp fails.
+        # They are taken from the class __dict__ because the values returned by
+        # attribute lookup on sip classes are not bound when set back.
+        self.addCleanup(setattr, QSettings, 'setValue',
+                        QSettings.__dict__['setValue'])
+        self.addCleanup(setattr, QFileDialog, 'getOpenFileName',
+                        QFileDialog.__dict__['getOpenFileName'])
+        QSettings.setValue = MagicMock()
+        QFileDialog.getOpenFileName = MagicMock()
+
+        # The window is shared by all tests - start each with the default
+        # template selected
+        self.window.view_metadata.popup_button.default()
+
+    def test_select_default(self):
         "User chooses the default template"
 
         # Set a non-default template before testing the default user template
@@ -34,38 +51,31 @@ class TestUserTemplateChoice(GUITest):
                         user_template_choice().current.name)
         self.assertEqual('Simple Darwin Core terms',
                          self.window.view_metadata.popup_button.text())
-        mock_setvalue.assert_called_with(user_template_choice().PATH_KEY, '')
+        QSettings.setValue.assert_called_with(user_template_choice().PATH_KEY, '')
 
-    @patch.object(QSettings, 'setValue')
-    def test_chooses_template(self, mock_setvalue):
+    def test_chooses_template(self):
         "User chooses a template"
 
         w = self.window
 
-        # Select default template before testing the choose method
-        w.view_metadata.popup_button.default()
-
         path = TESTDATA / 'test.inselect_template'
         retval = str(path), w.view_metadata.popup_button.FILE_FILTER
-        with patch.object(QFileDialog, 'getOpenFileName', return_value=retval) as mock_gofn:
-            w.view_metadata.popup_button.choose()
-            self.assertEqual(1, mock_gofn.call_count)
+        QFileDialog.getOpenFileName.return_value = retval
+        w.view_metadata.popup_button.choose()
+        self.assertEqual(1, QFileDialog.getOpenFileName.call_count)
 
         self.assertEqual('Test user template',
                          user_template_choice().current.name)
         self.assertEqual('Test user template',
                          self.window.view_metadata.popup_button.text())
-        mock_setvalue.assert_any_call(user_template_choice().PATH_KEY, str(path))
-        mock_setvalue.assert_any_call(user_template_choice().DIRECTORY_KEY, str(path.parent))
+        QSettings.setValue.assert_any_call(user_template_choice().PATH_KEY, str(path))
+        QSettings.setValue.assert_any_call(user_template_choice().DIRECTORY_KEY, str(path.parent))
 
-    @patch.object(QFileDialog, 'getOpenFileName', return_value=(None, None))
-    def test_cancels_choose_template(self, mock_gofn):
+    def test_cancels_choose_template(self):
         "User cancels the 'choose template' box"
 
         w = self.window
-
-        # Select default template before testing the choose method
-        w.view_metadata.popup_button.default()
+        QFileDialog.getOpenFileName.return_value = (None, None)
 
         w.view_metadata.popup_button.choose()
 
@@ -73,19 +83,18 @@ class TestUserTemplateChoice(GUITest):
                          user_template_choice().current.name)
         self.assertEqual('Simple Darwin Core terms',
                          self.window.view_metadata.popup_button.text())
-        self.assertEqual(1, mock_gofn.call_count)
+        self.assertEqual(1, QFileDialog.getOpenFileName.call_count)
 
     def test_refresh(self):
         "User refreshes the current, non-default template"
         w = self.window
-        with temp_directory_with_files(TESTDATA / 'test.inselect_template') as tempdir,\
-                patch.object(QSettings, 'setValue') as mock_setvalue:
+        with temp_directory_with_files(TESTDATA / 'test.inselect_template') as tempdir:
             path = tempdir / 'test.inselect_template'
             retval = str(path), w.view_metadata.popup_button.FILE_FILTER
             # Load the test template in tempdir
-            with patch.object(QFileDialog, 'getOpenFileName', return_value=retval) as mock_gofn:
-                w.view_metadata.popup_button.choose()
-                self.assertEqual(1, mock_gofn.call_count)
+            QFileDialog.getOpenFileName.return_value = retval
+            w.view_metadata.popup_button.choose()
+            self.assertEqual(1, QFileDialog.getOpenFileName.call_count)
 
             self.assertEqual('Test user template',
                              user_template_choice().current.name)
@@ -100,10 +109,19 @@ Fields:
             with path.open('w') as outfile:
                 outfile.write(template)
 
-            # Refresh loaded template
-            with patch.object(QSettings, 'value', return_value=str(path)) as mock_value:
-                w.view_metadata.popup_button.refresh()
-                self.assertEqual(1, mock_value.call_count)
+            # Refresh loaded template, with QSettings.value swapped for a
+            # function that counts its calls
+            calls = []
+
+            def value(settings, *args, **kwargs):
+                calls.append(args)
+                return str(path)
+
+            self.addCleanup(setattr, QSettings, 'value',
+                            QSettings.__dict__['value'])
+            QSettings.value = value
+            w.view_metadata.popup_button.refresh()
+            self.assertEqual(1, len(calls))
 
             self.assertEqual("An updated test template",
                              user_template_choice().current.name)
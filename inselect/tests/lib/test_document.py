@@ -17,16 +17,46 @@ from inselect.lib.inselect_error import InselectError
 from inselect.lib.rect import Rect
 from inselect.lib.utils import make_readonly
 
-from inselect.tests.utils import temp_directory_with_files
+from inselect.tests.utils import SharedTempDirectory
 
 
-TESTDATA = Path(__file__).parent.parent / 'test_data'
+TESTDATA = (Path(__file__).parent.parent / 'test_data').resolve()
 
+# Paths used by most tests, built once
+SHAPES_INSELECT = TESTDATA / 'shapes.inselect'
+SHAPES_PNG = TESTDATA / 'shapes.png'
+
+# Contents of shapes.inselect, read once
+SHAPES_INSELECT_BYTES = SHAPES_INSELECT.read_bytes()
+
+# Thumbnail widths that InselectDocument.new_from_scan should reject
+BAD_THUMBNAIL_WIDTHS = (-1, 50, 20000)
+
+# Documents with versions that InselectDocument.load should reject
+UNSUPPORTED_VERSION_DOCUMENTS = (
+    b'{"items": [], "inselect version": 1000}',
+    b'{"items": [], "inselect version": -1}',
+)
+
+
+def _write_shapes_inselect(path):
+    "Writes the contents of shapes.inselect to path and returns path"
+    path.write_bytes(SHAPES_INSELECT_BYTES)
+    return path
+
+
+class TestDocument(SharedTempDirectory, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Tests that do not alter the document share a single loaded instance
+        cls.reference_doc = InselectDocument.load(SHAPES_INSELECT)
+        cls.reference_items = cls.reference_doc.items
+
+        super(TestDocument, cls).setUpClass()
 
-class TestDocument(unittest.TestCase):
     def test_load(self):
         "Load a document from a file"
-        path = TESTDATA / 'shapes.inselect'
+        path = SHAPES_INSELECT
         doc = InselectDocument.load(path)
 
         # Properties are as expected
@@ -55,20 +85,20 @@ class TestDocument(unittest.TestCase):
 
     def test_open_non_ascii(self):
         "Open an inselect document with non-ascii characters in the filename"
-        with temp_directory_with_files() as tempdir:
-            stem = 'åland'
-            path = tempdir.joinpath('{0}.inselect'.format(stem))
-
-            shutil.copy(str(TESTDATA.joinpath('shapes.inselect')), str(path))
-            shutil.copy(
-                str(TESTDATA.joinpath('shapes.png')),
-                str(tempdir.joinpath('{0}.png'.format(stem)))
-            )
+        tempdir = self.temp_directory()
+        stem = 'åland'
+        path = tempdir.joinpath('{0}.inselect'.format(stem))
+
+        _write_shapes_inselect(path)
+        shutil.copy(
+            str(SHAPES_PNG),
+            str(tempdir.joinpath('{0}.png'.format(stem)))
+        )
 
-            doc = InselectDocument.load(path)
+        doc = InselectDocument.load(path)
 
-            # Properties are as expected
-            self.assertEqual(doc.document_path, path)
+        # Properties are as expected
+        self.assertEqual(doc.document_path, path)
 
     def _test_load_fails(self, contents):
         """Helper that writes contents to a temp file and asserts that
@@ -80,7 +110,8 @@ class TestDocument(unittest.TestCase):
             f.write(contents)
             f.seek(0)
             f.close()
-            self.assertRaises(InselectError, InselectDocument.load, f.name)
+            with self.assertRaises(InselectError, msg=contents):
+                InselectDocument.load(f.name)
         finally:
             os.unlink(f.name)
 
@@ -101,7 +132,7 @@ class TestDocument(unittest.TestCase):
             InselectError,
             'thumbnail should be an instance of InselectImage',
             InselectDocument,
-            scanned_path=TESTDATA / 'shapes.png',
+            scanned_path=SHAPES_PNG,
             thumbnail='hello'
         )
 
@@ -115,87 +146,82 @@ class TestDocument(unittest.TestCase):
 
     def test_load_bad_version(self):
         "Try to load an inselect document with an unsupported version"
-        self._test_load_fails(b'{"items": [], "inselect version": 1000}')
-        self._test_load_fails(b'{"items": [], "inselect version": -1}')
+        for contents in UNSUPPORTED_VERSION_DOCUMENTS:
+            with self.subTest(contents=contents):
+                self._test_load_fails(contents)
 
     def test_load_images(self):
         "Load document's images"
-        source = TESTDATA / 'shapes.inselect'
-        with temp_directory_with_files(TESTDATA / 'shapes.inselect') as tempdir:
-            doc_temp = tempdir / 'shapes.inselect'
-            with doc_temp.open('w') as outfile, source.open() as infile:
-                outfile.write(infile.read())
-
-            # Document load with neither scanned image file nor thumbnail
-            self.assertRaises(InselectError, InselectDocument.load, doc_temp)
-
-            # Document load with thumbnail but no scanned image file
-            thumbnail_temp = tempdir / 'shapes_thumbnail.jpg'
-            thumbnail_temp.touch()       # File only needs to exist
-            doc = InselectDocument.load(doc_temp)
-            self.assertFalse(doc.scanned.available)
-            self.assertTrue(doc.thumbnail.available)
-
-            # Document load with both scanned and thumbnail files
-            scanned_temp = tempdir / 'shapes.png'
-            scanned_temp.touch()       # File only needs to exist
-            actual = InselectDocument.load(doc_temp)
-            self.assertEqual(InselectDocument.load(source).items, actual.items)
-            self.assertTrue(actual.scanned.available)
-            self.assertTrue(actual.thumbnail.available)
-
-            # Document load with scanned image file but not thumbnail
-            os.unlink(str(thumbnail_temp))
-            actual = InselectDocument.load(doc_temp)
-            self.assertEqual(InselectDocument.load(source).items, actual.items)
-            self.assertTrue(actual.scanned.available)
-            self.assertFalse(actual.thumbnail.available)
+        tempdir = self.temp_directory()
+        doc_temp = _write_shapes_inselect(tempdir / 'shapes.inselect')
+
+        # Document load with neither scanned image file nor thumbnail
+        self.assertRaises(InselectError, InselectDocument.load, doc_temp)
+
+        # Document load with thumbnail but no scanned image file
+        thumbnail_temp = tempdir / 'shapes_thumbnail.jpg'
+        thumbnail_temp.touch()       # File only needs to exist
+        doc = InselectDocument.load(doc_temp)
+        self.assertFalse(doc.scanned.available)
+        self.assertTrue(doc.thumbnail.available)
+
+        # Document load with both scanned and thumbnail files
+        scanned_temp = tempdir / 'shapes.png'
+        scanned_temp.touch()       # File only needs to exist
+        actual = InselectDocument.load(doc_temp)
+        self.assertEqual(self.reference_items, actual.items)
+        self.assertTrue(actual.scanned.available)
+        self.assertTrue(actual.thumbnail.available)
+
+        # Document load with scanned image file but not thumbnail
+        os.unlink(str(thumbnail_temp))
+        actual = InselectDocument.load(doc_temp)
+        self.assertEqual(self.reference_items, actual.items)
+        self.assertTrue(actual.scanned.available)
+        self.assertFalse(actual.thumbnail.available)
 
     def test_save(self):
         "Save document"
-        with temp_directory_with_files(TESTDATA / 'shapes.inselect',
-                                       TESTDATA / 'shapes.png') as tempdir:
-            items = [{
-                'fields': {'type': 'インセクト'},
-                'rect': Rect(0.1, 0.2, 0.5, 0.5),
-            }]
+        tempdir = self.temp_directory(SHAPES_PNG)
+        items = [{
+            'fields': {'type': 'インセクト'},
+            'rect': Rect(0.1, 0.2, 0.5, 0.5),
+        }]
 
-            doc_temp = tempdir / 'shapes.inselect'
-            d = InselectDocument.load(doc_temp)
-            d.set_items(items)
-            d.save()
+        doc_temp = _write_shapes_inselect(tempdir / 'shapes.inselect')
+        d = InselectDocument.load(doc_temp)
+        d.set_items(items)
+        d.save()
 
-            self.assertEqual(items, InselectDocument.load(doc_temp).items)
+        self.assertEqual(items, InselectDocument.load(doc_temp).items)
 
-            # Saved on time should be within last 2 seconds
-            now = datetime.now(pytz.timezone("UTC"))
-            saved_on = d.properties['Saved on']
-            self.assertLessEqual((now - saved_on).seconds, 2)
+        # Saved on time should be within last 2 seconds
+        now = datetime.now(pytz.timezone("UTC"))
+        saved_on = d.properties['Saved on']
+        self.assertLessEqual((now - saved_on).seconds, 2)
 
     def test_repr(self):
-        path = TESTDATA / 'shapes.inselect'
-        doc = InselectDocument.load(path)
+        doc = self.reference_doc
         expected = "InselectDocument ['{0}'] [5 items]".format(str(doc.scanned.path))
         self.assertEqual(expected, repr(doc))
 
     def test_crops(self):
         "Cropped object images are as expected"
-        path = TESTDATA / 'shapes.inselect'
-        doc = InselectDocument.load(path)
+        doc = self.reference_doc
 
         self.assertEqual(5, len(doc.items))
 
         # Check the contents of each crop
+        scanned = doc.scanned.array
         boxes = doc.scanned.from_normalised([i['rect'] for i in doc.items])
         for box, crop in zip(boxes, doc.crops):
             x0, y0, x1, y1 = box.coordinates
-            self.assertTrue(np.all(doc.scanned.array[y0:y1, x0:x1] == crop))
+            self.assertTrue(np.array_equal(scanned[y0:y1, x0:x1], crop))
 
     def test_set_items(self):
         "Items are set as expected"
         # TODO LH Check field validation
-        path = TESTDATA / 'shapes.inselect'
-        doc = InselectDocument.load(path)
+        doc = self.reference_doc.copy()
 
         items = [{'fields': {}, 'rect': Rect(0, 0, 0.5, 0.5)}]
         doc.set_items(items)
@@ -203,34 +229,34 @@ class TestDocument(unittest.TestCase):
 
     def test_new_from_scan(self):
         "New document is created and saved"
-        with temp_directory_with_files(TESTDATA / 'shapes.png') as tempdir:
-            doc = InselectDocument.new_from_scan(tempdir / 'shapes.png')
-            self.assertTrue(doc.document_path.is_file())
-            self.assertEqual(tempdir / 'shapes.png', doc.scanned.path)
+        tempdir = self.temp_directory(SHAPES_PNG)
+        doc = InselectDocument.new_from_scan(tempdir / 'shapes.png')
+        self.assertTrue(doc.document_path.is_file())
+        self.assertEqual(tempdir / 'shapes.png', doc.scanned.path)
 
-            # Saved on time should be within last 2 seconds
-            now = datetime.now(pytz.timezone("UTC"))
-            created_on = doc.properties['Created on']
-            self.assertLessEqual((now - created_on).seconds, 2)
+        # Saved on time should be within last 2 seconds
+        now = datetime.now(pytz.timezone("UTC"))
+        created_on = doc.properties['Created on']
+        self.assertLessEqual((now - created_on).seconds, 2)
 
     def test_new_from_scan_doc_exists(self):
         "Document of scanned image already exists"
-        path = TESTDATA / 'shapes.png'
+        path = SHAPES_PNG
         self.assertRaises(InselectError, InselectDocument.new_from_scan, path)
 
     def test_new_from_thumbnail(self):
         "Can't create a document from a thumbnail image"
-        with temp_directory_with_files(TESTDATA / 'shapes.png') as tempdir:
-            doc = InselectDocument.new_from_scan(
-                tempdir / 'shapes.png',
-                thumbnail_width_pixels=2048
-            )
-            thumbnail = tempdir / 'shapes_thumbnail.jpg'
-            self.assertTrue(thumbnail.is_file())
-            self.assertTrue(doc.thumbnail.available)
-            self.assertEqual(2048, doc.thumbnail.array.shape[1])
-            self.assertRaises(InselectError, InselectDocument.new_from_scan,
-                              thumbnail)
+        tempdir = self.temp_directory(SHAPES_PNG)
+        doc = InselectDocument.new_from_scan(
+            tempdir / 'shapes.png',
+            thumbnail_width_pixels=2048
+        )
+        thumbnail = tempdir / 'shapes_thumbnail.jpg'
+        self.assertTrue(thumbnail.is_file())
+        self.assertTrue(doc.thumbnail.available)
+        self.assertEqual(2048, doc.thumbnail.array.shape[1])
+        self.assertRaises(InselectError, InselectDocument.new_from_scan,
+                          thumbnail)
 
     def test_new_from_scan_no_image(self):
         "Image does not exist"
@@ -240,20 +266,11 @@ class TestDocument(unittest.TestCase):
 
     def test_thumbnail_silly_size(self):
         "Can't create thumbnail with a silly size"
-        with temp_directory_with_files(TESTDATA / 'shapes.png') as tempdir:
-            self.assertRaisesRegex(
-                InselectError, "width should be between",
-                InselectDocument.new_from_scan, tempdir / 'shapes.png', -1
-            )
-            self.assertRaisesRegex(
-                InselectError, "width should be between",
-                InselectDocument.new_from_scan, tempdir / 'shapes.png', 50
-            )
-            self.assertRaisesRegex(
-                InselectError, "width should be between",
-                InselectDocument.new_from_scan, tempdir / 'shapes.png',
-                20000
-            )
+        tempdir = self.temp_directory(SHAPES_PNG)
+        for width in BAD_THUMBNAIL_WIDTHS:
+            with self.subTest(width=width), self.assertRaisesRegex(
+                    InselectError, "width should be between", msg=width):
+                InselectDocument.new_from_scan(tempdir / 'shapes.png', width)
 
     @unittest.skipIf(sys.platform.startswith("win"),
                      "Read-only directories not available on Windows")
@@ -261,34 +278,34 @@ class TestDocument(unittest.TestCase):
         "Can't write thumbnail to a read-only directory"
         # This case is doing more than simply testing filesystem behavour
         # because it tests the failure code in InselectDocument
-        with temp_directory_with_files(TESTDATA / 'shapes.png') as tempdir:
-            mode = make_readonly(tempdir)
+        tempdir = self.temp_directory(SHAPES_PNG)
+        mode = make_readonly(tempdir)
 
-            self.assertRaises(
-                InselectError, InselectDocument.new_from_scan,
-                tempdir / 'shapes.png', thumbnail_width_pixels=2048
-            )
+        self.assertRaises(
+            InselectError, InselectDocument.new_from_scan,
+            tempdir / 'shapes.png', thumbnail_width_pixels=2048
+        )
 
-            # Restor the original mode
-            tempdir.chmod(mode)
+        # Restor the original mode
+        tempdir.chmod(mode)
 
     def test_thumbnail_path_of_scanned(self):
         self.assertEqual(Path('x_thumbnail.jpg'),
                          InselectDocument.thumbnail_path_of_scanned('x.png'))
 
     def test_path_is_thumbnail_file(self):
-        with temp_directory_with_files() as tempdir:
-            thumbnail = tempdir / 'xx_thumbnail.jpg'
-            thumbnail.touch()       # File only needs to exist
+        tempdir = self.temp_directory()
+        thumbnail = tempdir / 'xx_thumbnail.jpg'
+        thumbnail.touch()       # File only needs to exist
 
-            # Thumbnail file exists but there is no corresponding .inselect doc
-            self.assertFalse(InselectDocument.path_is_thumbnail_file(thumbnail))
+        # Thumbnail file exists but there is no corresponding .inselect doc
+        self.assertFalse(InselectDocument.path_is_thumbnail_file(thumbnail))
 
-            doc = tempdir / 'xx.inselect'
-            doc.touch()       # File only needs to exist
+        doc = tempdir / 'xx.inselect'
+        doc.touch()       # File only needs to exist
 
-            # Thumbnail file and corresponding .inselect file both exist
-            self.assertTrue(InselectDocument.path_is_thumbnail_file(thumbnail))
+        # Thumbnail file and corresponding .inselect file both exist
+        self.assertTrue(InselectDocument.path_is_thumbnail_file(thumbnail))
 
 if __name__ == '__main__':
     unittest.main()
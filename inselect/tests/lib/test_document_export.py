@@ -5,7 +5,6 @@ import unittest
 from operator import itemgetter
 from pathlib import Path
 
-import cv2
 import numpy as np
 import unicodecsv
 
@@ -13,12 +12,16 @@ from inselect.lib.document import InselectDocument
 from inselect.lib.document_export import DocumentExport
 from inselect.lib.user_template import UserTemplate
 
-from inselect.tests.utils import temp_directory_with_files
+from inselect.tests.utils import SharedTempDirectory, temp_directory_with_files
 
-TESTDATA = Path(__file__).parent.parent / 'test_data'
+TESTDATA = (Path(__file__).parent.parent / 'test_data').resolve()
 
+# Paths used by most tests, built once
+SHAPES_INSELECT = TESTDATA / 'shapes.inselect'
+SHAPES_PNG = TESTDATA / 'shapes.png'
 
-class TestDocumentExportWithTemplate(unittest.TestCase):
+
+class TestDocumentExportWithTemplate(SharedTempDirectory, unittest.TestCase):
     TEMPLATE = UserTemplate({
         'Name': 'Test',
         'Cropped file suffix': '.png',
@@ -44,34 +47,41 @@ class TestDocumentExportWithTemplate(unittest.TestCase):
         ]
     })
 
-    def test_save_crops(self):
-        "Cropped object images are written correctly"
-        with temp_directory_with_files(TESTDATA / 'shapes.inselect',
-                                       TESTDATA / 'shapes.png') as tempdir:
-            doc = InselectDocument.load(tempdir / 'shapes.inselect')
+    @classmethod
+    def setUpSharedTempDirectory(cls):
+        # Crops are written once and inspected by each of the save_crops tests
+        tempdir = cls.shared_temp_directory('save_crops', SHAPES_INSELECT,
+                                            SHAPES_PNG)
+        cls.crops_doc = InselectDocument.load(tempdir / 'shapes.inselect')
+        cls.crops_dir = DocumentExport(cls.TEMPLATE).save_crops(cls.crops_doc)
+        cls.crop_paths = sorted(cls.crops_dir.glob('*.png'))
 
-            crops_dir = DocumentExport(self.TEMPLATE).save_crops(doc)
+    def test_save_crops(self):
+        "Cropped object images are written with the expected names"
+        self.assertTrue(self.crops_dir.is_dir())
+        self.assertEqual(self.crops_dir, self.crops_doc.crops_dir)
 
-            self.assertTrue(crops_dir.is_dir())
-            self.assertEqual(crops_dir, doc.crops_dir)
+        self.assertEqual(
+            ['01_1.png', '02_2.png', '03_10.png', '04_3.png', '05_4.png'],
+            [f.name for f in self.crop_paths]
+        )
 
-            cropped_fnames = sorted(crops_dir.glob('*.png'))
-            self.assertEqual(
-                ['01_1.png', '02_2.png', '03_10.png', '04_3.png', '05_4.png'],
-                [f.name for f in cropped_fnames]
-            )
+    def test_save_crops_contents(self):
+        "Cropped object images contain the expected pixels"
+        # Local import - cv2 is slow to import and is used only by this test
+        import cv2
 
-            # Check the contents of each file
-            boxes = doc.scanned.from_normalised(i['rect'] for i in doc.items)
-            for box, path in zip(boxes, sorted(crops_dir.glob('*.png'))):
-                x0, y0, x1, y1 = box.coordinates
-                self.assertTrue(np.all(doc.scanned.array[y0:y1, x0:x1] ==
-                                       cv2.imread(str(path))))
+        doc = self.crops_doc
+        scanned = doc.scanned.array
+        boxes = doc.scanned.from_normalised(i['rect'] for i in doc.items)
+        for box, path in zip(boxes, self.crop_paths):
+            x0, y0, x1, y1 = box.coordinates
+            self.assertTrue(np.array_equal(scanned[y0:y1, x0:x1],
+                                           cv2.imread(str(path))))
 
     def test_cancel_save_crops(self):
         "User cancels save crops"
-        with temp_directory_with_files(TESTDATA / 'shapes.inselect',
-                                       TESTDATA / 'shapes.png') as tempdir:
+        with temp_directory_with_files(SHAPES_INSELECT, SHAPES_PNG) as tempdir:
             doc = InselectDocument.load(tempdir / 'shapes.inselect')
 
             # Create crops dir with some data
@@ -102,8 +112,7 @@ class TestDocumentExportWithTemplate(unittest.TestCase):
 
     def test_csv_export(self):
         "CSV data are exported as expected"
-        with temp_directory_with_files(TESTDATA / 'shapes.inselect',
-                                       TESTDATA / 'shapes.png') as tempdir:
+        with temp_directory_with_files(SHAPES_INSELECT, SHAPES_PNG) as tempdir:
             doc = InselectDocument.load(tempdir / 'shapes.inselect')
 
             csv_path = DocumentExport(self.TEMPLATE).export_csv(doc)
@@ -46,8 +46,7 @@ class TestExportCSV(unittest.TestCase):
 
             # Create an empty CSV file
             csv = tempdir / 'shapes.csv'
-            with csv.open('w'):
-                pass
+            csv.touch()
 
             main([str(tempdir), '--overwrite'])
 
@@ -20,3 +20,51 @@ def temp_directory_with_files(*paths):
         yield temp
     finally:
         rmtree_readonly(temp)
+
+
+class SharedTempDirectory(object):
+    """Mixin for TestCase classes that creates a single temporary directory for
+    the class, removed when all of the class's tests have run.
+
+    Class-level setup that writes to the directory belongs in
+    setUpSharedTempDirectory, which removes the directory if it raises. Other
+    class-level setup should run before SharedTempDirectory.setUpClass, so
+    that the directory is created last.
+    """
+    @classmethod
+    def setUpClass(cls):
+        super(SharedTempDirectory, cls).setUpClass()
+        cls._shared_temp = Path(tempfile.mkdtemp())
+        try:
+            cls.setUpSharedTempDirectory()
+        except Exception:
+            # tearDownClass is not called if setUpClass raises
+            rmtree_readonly(cls._shared_temp)
+            raise
+
+    @classmethod
+    def setUpSharedTempDirectory(cls):
+        "Hook for class-level setup that writes to the shared directory"
+        pass
+
+    @classmethod
+    def tearDownClass(cls):
+        rmtree_readonly(cls._shared_temp)
+        super(SharedTempDirectory, cls).tearDownClass()
+
+    @classmethod
+    def shared_temp_directory(cls, name, *paths):
+        """Creates and returns a directory called name within the shared
+        temporary directory, and copies all paths to it.
+        """
+        temp = cls._shared_temp / name
+        temp.mkdir()
+        for p in paths:
+            shutil.copy(str(p), str(temp / Path(p).name))
+        return temp
+
+    def temp_directory(self, *paths):
+        """Creates and returns a directory for the current test within the
+        shared temporary directory, and copies all paths to it.
+        """
+        return self.shared_temp_directory(self._testMethodName, *paths)